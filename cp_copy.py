@@ -11,6 +11,20 @@ import time
 import argparse
 import subprocess
 import pprint
+import hashlib
+import tempfile
+import base64
+import struct
+import zlib
+import errno
+import filecmp
+import mmap
+import threading
+import queue
+import json
+import http.client
+import urllib.parse
+import concurrent.futures
 from contextlib import contextmanager
 
 
@@ -34,6 +48,499 @@ def cd(newdir):
         os.chdir(prevdir)
 
 
+def get_cache_dir(*subdirs):
+    """
+    Get (and create) the cache directory for this helper.
+
+    respects XDG_CACHE_HOME and defaults to ~/.cache/cp_copy
+    """
+    cache_base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    path = os.path.join(cache_base, "cp_copy", *subdirs)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_hash(filename):
+    """
+    Calculate sha256 hex digest of file content.
+
+    reads are mmap backed - hashlib releases the GIL for these
+    so this can run in parallel threads.
+    """
+    hash_obj = hashlib.sha256()
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                hash_obj.update(data)
+    return hash_obj.hexdigest()
+
+
+##########################################
+
+
+class SerialREPLTransport:
+    """
+    Write files over the serial console (raw REPL).
+
+    uses the raw-paste mode with its flow control if the board supports it -
+    otherwise falls back to the plain raw REPL with chunked writes.
+    data is transferred base64 encoded and verified on the board with crc32.
+    """
+
+    CHUNK_SIZE = 2048
+    RAW_REPL_BANNER = b"raw REPL; CTRL-B to exit\r\n"
+
+    def __init__(self, port, *, baudrate=115200, timeout=10, verbose=0):  # noqa
+        """Init."""
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.verbose = verbose
+        self.serial = None
+        self.raw_paste_supported = None
+        self.uid = None
+        self.bytes_written = 0
+
+    def open(self):
+        """Open port and enter raw REPL."""
+        import serial
+
+        self.serial = serial.serial_for_url(
+            self.port, baudrate=self.baudrate, timeout=self.timeout
+        )
+        # stop running program
+        self.serial.write(b"\r\x03")
+        time.sleep(0.1)
+        self.serial.write(b"\x03")
+        time.sleep(0.1)
+        self.serial.reset_input_buffer()
+        # enter raw REPL
+        self.serial.write(b"\r\x01")
+        self.read_until(self.RAW_REPL_BANNER + b">")
+        if self.verbose:
+            print("raw REPL on '{}' active.".format(self.port))
+
+    def close(self):
+        """Leave raw REPL and soft reload so that the code runs again."""
+        if self.serial:
+            # open() has stopped the running program - always restart it.
+            self.serial.write(b"\r\x02")
+            time.sleep(0.1)
+            self.serial.write(b"\x04")
+            self.serial.close()
+            self.serial = None
+
+    def read_until(self, ending, data=b""):
+        """Read until ending was received. (data: already received bytes)"""
+        timeout_start = time.monotonic()
+        while not data.endswith(ending):
+            new_data = self.serial.read(1)
+            if new_data:
+                data += new_data
+                timeout_start = time.monotonic()
+            elif (time.monotonic() - timeout_start) > self.timeout:
+                raise TimeoutError(
+                    "serial REPL: timeout waiting for {!r}. got: {!r}".format(ending, data)
+                )
+        return data
+
+    def exec_raw_paste(self, command):
+        """Send command in raw-paste mode (with flow control)."""
+        self.serial.write(b"\x05A\x01")
+        response = self.serial.read(2)
+        if response != b"R\x01":
+            if response != b"R\x00":
+                # old firmware: it prints the banner again.
+                # the first bytes of it are already in response.
+                self.read_until(self.RAW_REPL_BANNER + b">", data=response)
+            return False
+        window_size_data = self.serial.read(2)
+        if len(window_size_data) != 2:
+            raise TimeoutError("serial REPL: timeout waiting for raw-paste window size.")
+        window_size = struct.unpack("<H", window_size_data)[0]
+        window_remain = window_size
+        index = 0
+        while index < len(command):
+            while window_remain == 0 or self.serial.in_waiting:
+                flag = self.serial.read(1)
+                if flag == b"\x01":
+                    window_remain += window_size
+                elif flag == b"\x04":
+                    # board wants us to stop.
+                    self.serial.write(b"\x04")
+                    raise OSError("serial REPL: board aborted raw-paste transfer.")
+                elif not flag:
+                    raise TimeoutError("serial REPL: timeout in raw-paste flow control.")
+            chunk = command[index : index + min(window_remain, len(command) - index)]
+            self.serial.write(chunk)
+            window_remain -= len(chunk)
+            index += len(chunk)
+        self.serial.write(b"\x04")
+        self.read_until(b"\x04")
+        return True
+
+    def exec_raw(self, command):
+        """Send command in plain raw REPL mode."""
+        for index in range(0, len(command), 256):
+            self.serial.write(command[index : index + 256])
+            time.sleep(0.01)
+        self.serial.write(b"\x04")
+        response = self.serial.read(2)
+        if response != b"OK":
+            raise OSError("serial REPL: could not exec command. got: {!r}".format(response))
+
+    def exec(self, command):
+        """Execute command on board and return output."""
+        command = command.encode()
+        if self.raw_paste_supported is not False:
+            self.raw_paste_supported = self.exec_raw_paste(command)
+        if not self.raw_paste_supported:
+            self.exec_raw(command)
+        output = self.read_until(b"\x04")[:-1]
+        error = self.read_until(b"\x04")[:-1]
+        self.read_until(b">")
+        if error:
+            raise OSError("serial REPL: remote error:\n{}".format(error.decode()))
+        return output.decode()
+
+    def write_file(self, source, destination):
+        """Write file to board and verify crc32."""
+        time_start = time.monotonic()
+        with open(source, "rb") as f:
+            data = f.read()
+        self.exec(
+            "import os, binascii\n"
+            "p = ''\n"
+            "for d in {dirs!r}:\n"
+            "    p += '/' + d\n"
+            "    try:\n"
+            "        os.mkdir(p)\n"
+            "    except OSError:\n"
+            "        pass\n"
+            "f = open({destination!r}, 'wb')\n"
+            "".format(
+                dirs=[d for d in os.path.dirname(destination).split("/") if d],
+                destination=destination,
+            )
+        )
+        try:
+            for index in range(0, len(data), self.CHUNK_SIZE):
+                chunk = base64.b64encode(data[index : index + self.CHUNK_SIZE])
+                self.exec("f.write(binascii.a2b_base64({!r}))\n".format(chunk))
+        finally:
+            self.exec("f.close()\n")
+        crc_remote = self.crc32(destination)
+        crc_local = zlib.crc32(data) & 0xFFFFFFFF
+        if crc_remote != crc_local:
+            raise OSError(
+                "serial REPL: verification of '{}' failed. "
+                "(crc32 local {:08x} remote {:08x})".format(
+                    destination, crc_local, crc_remote
+                )
+            )
+        duration = time.monotonic() - time_start
+        self.bytes_written += len(data)
+        if self.verbose:
+            print(
+                "{} bytes written in {:.2f}s ({:.1f}kB/s)".format(
+                    len(data), duration, len(data) / 1024 / max(duration, 1e-6)
+                )
+            )
+
+    def board_uid(self):
+        """Get UID of the board. (None if not available)"""
+        if self.uid is None:
+            self.uid = self.exec(
+                "try:\n"
+                "    import microcontroller\n"
+                "    print(''.join('%02X' % b for b in microcontroller.cpu.uid))\n"
+                "except (ImportError, AttributeError):\n"
+                "    print('')\n"
+            ).strip()
+        return self.uid or None
+
+    def write_files(self, file_list):
+        """
+        Write all files in file_list (one after the other).
+
+        returns list of failed (source, destination, error).
+        """
+        failed = []
+        for source, destination in file_list:
+            try:
+                self.write_file(source, destination)
+            except OSError as e:
+                failed.append((source, destination, e))
+        return failed
+
+    def crc32(self, destination):
+        """Calculate crc32 of file on the board."""
+        return int(
+            self.exec(
+                "import binascii\n"
+                "c = 0\n"
+                "with open({destination!r}, 'rb') as f:\n"
+                "    while True:\n"
+                "        b = f.read(512)\n"
+                "        if not b:\n"
+                "            break\n"
+                "        c = binascii.crc32(b, c)\n"
+                "print(c & 0xFFFFFFFF)\n"
+                "".format(destination=destination)
+            ).strip()
+        )
+
+    def file_size(self, destination):
+        """Get size of file on the board. (None if it does not exist)"""
+        size = int(
+            self.exec(
+                "import os\n"
+                "try:\n"
+                "    print(os.stat({destination!r})[6])\n"
+                "except OSError:\n"
+                "    print(-1)\n"
+                "".format(destination=destination)
+            ).strip()
+        )
+        if size < 0:
+            return None
+        return size
+
+    def is_unchanged(self, source, destination):
+        """Check if file on the board has same size and crc32."""
+        if self.file_size(destination) != os.path.getsize(source):
+            return False
+        with open(source, "rb") as f:
+            crc_local = zlib.crc32(f.read()) & 0xFFFFFFFF
+        return self.crc32(destination) == crc_local
+
+    def delete_file(self, destination):
+        """Delete file on the board."""
+        self.exec("import os\nos.remove({!r})\n".format(destination))
+
+    def free_space(self):
+        """Get (bytes free, cluster size) of the board filesystem."""
+        block_size, blocks_free = self.exec(
+            "import os\ns = os.statvfs('/')\nprint(s[1], s[4])\n"
+        ).split()
+        return int(blocks_free) * int(block_size), int(block_size)
+
+
+class WebWorkflowTransport:
+    """
+    Write files with the CircuitPython web workflow file API.
+
+    keeps a pool of keep-alive connections and uploads files in parallel.
+    files with same size and timestamp as on the board are skipped.
+    """
+
+    def __init__(
+        self, host, *, password="", parallel=4, timeout=10, verbose=0  # noqa
+    ):
+        """Init."""
+        if "://" not in host:
+            host = "http://" + host
+        self.url = urllib.parse.urlsplit(host)
+        self.password = password
+        self.parallel = parallel
+        self.timeout = timeout
+        self.verbose = verbose
+        self.pool = None
+        self.lock = threading.RLock()
+        self.dirs_known = set()
+        self.listings = {}
+        self.disk_info = {}
+        self.bytes_written = 0
+
+    def open(self):
+        """Prepare connection pool."""
+        self.pool = queue.LifoQueue()
+        self.dirs_known = set(["/"])
+        self.listings = {}
+
+    def close(self):
+        """Close all pooled connections."""
+        if self.pool:
+            while not self.pool.empty():
+                self.pool.get_nowait().close()
+            self.pool = None
+
+    def connection_create(self):
+        """Create new connection."""
+        if self.url.scheme == "https":
+            return http.client.HTTPSConnection(self.url.netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(self.url.netloc, timeout=self.timeout)
+
+    def request(self, method, path, body=None, headers=None):
+        """Send request on pooled connection and return (status, reason, data)."""
+        headers = dict(headers or {})
+        credentials = base64.b64encode(":{}".format(self.password).encode())
+        headers["Authorization"] = "Basic " + credentials.decode()
+        url = "/fs" + urllib.parse.quote(path)
+        try:
+            connection = self.pool.get_nowait()
+        except queue.Empty:
+            connection = self.connection_create()
+        try:
+            try:
+                connection.request(method, url, body=body, headers=headers)
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                # keep-alive connection was closed by the board. retry once.
+                connection.close()
+                connection.request(method, url, body=body, headers=headers)
+                response = connection.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            self.pool.put(connection)
+        return response.status, response.reason, data
+
+    def list_dir(self, path):
+        """Get (cached) listing of directory. returns dict name → entry."""
+        path = path.rstrip("/") + "/"
+        with self.lock:
+            if path in self.listings:
+                return self.listings[path]
+        status, reason, data = self.request(
+            "GET", path, headers={"Accept": "application/json"}
+        )
+        entries = {}
+        if status == 200:
+            listing = json.loads(data)
+            # CircuitPython >= 9 wraps the file list in an object.
+            if isinstance(listing, dict):
+                with self.lock:
+                    self.disk_info = listing
+                listing = listing.get("files", [])
+            for entry in listing:
+                entries[entry["name"]] = entry
+        elif status != 404:
+            raise OSError(
+                "web workflow: listing '{}' failed: {} {}".format(path, status, reason)
+            )
+        with self.lock:
+            self.listings[path] = entries
+        return entries
+
+    def makedirs(self, path):
+        """Create directory and all parents (if needed)."""
+        with self.lock:
+            current = ""
+            for part in [p for p in path.split("/") if p]:
+                parent = current
+                current += "/" + part
+                if current in self.dirs_known:
+                    continue
+                entry = self.list_dir(parent).get(part)
+                if entry and entry.get("directory"):
+                    self.dirs_known.add(current)
+                    continue
+                status, reason, _ = self.request("PUT", current + "/")
+                if status not in (201, 204):
+                    raise OSError(
+                        "web workflow: creating folder '{}' failed: {} {}".format(
+                            current, status, reason
+                        )
+                    )
+                self.dirs_known.add(current)
+
+    def is_unchanged(self, source, destination):
+        """Check if file on the board has same size and timestamp."""
+        directory, filename = os.path.split(destination)
+        entry = self.list_dir(directory).get(filename)
+        if not entry or entry.get("directory"):
+            return False
+        stat = os.stat(source)
+        # FAT timestamps have a resolution of 2 seconds.
+        return (
+            entry.get("file_size") == stat.st_size
+            and abs(entry.get("modified_ns", 0) - stat.st_mtime_ns) <= 2 * 10**9
+        )
+
+    def file_size(self, destination):
+        """Get size of file on the board. (None if it does not exist)"""
+        directory, filename = os.path.split(destination)
+        entry = self.list_dir(directory).get(filename)
+        if not entry or entry.get("directory"):
+            return None
+        return entry.get("file_size")
+
+    def delete_file(self, destination):
+        """Delete file on the board."""
+        status, reason, _ = self.request("DELETE", destination)
+        if status not in (200, 204, 404):
+            raise OSError(
+                "web workflow: deleting '{}' failed: {} {}".format(
+                    destination, status, reason
+                )
+            )
+        directory, filename = os.path.split(destination)
+        with self.lock:
+            self.listings.get(directory.rstrip("/") + "/", {}).pop(filename, None)
+
+    def free_space(self):
+        """Get (bytes free, cluster size) of the board filesystem."""
+        self.list_dir("/")
+        if "free" not in self.disk_info:
+            # older CircuitPython versions do not report the free space.
+            return None
+        block_size = self.disk_info.get("block_size", 512)
+        return self.disk_info["free"] * block_size, block_size
+
+    def write_file(self, source, destination):
+        """Upload file (skip if unchanged)."""
+        if self.is_unchanged(source, destination):
+            if self.verbose:
+                print("unchanged: '{}'".format(destination))
+            return False
+        self.makedirs(os.path.dirname(destination))
+        with open(source, "rb") as f:
+            data = f.read()
+        headers = {
+            "X-Timestamp": str(os.stat(source).st_mtime_ns // 10**6),
+            "Content-Length": str(len(data)),
+        }
+        status, reason, _ = self.request("PUT", destination, body=data, headers=headers)
+        if status not in (201, 204):
+            raise OSError(
+                "web workflow: upload of '{}' failed: {} {}".format(
+                    destination, status, reason
+                )
+            )
+        with self.lock:
+            self.bytes_written += len(data)
+        if self.verbose:
+            print("uploaded: '{}' ({} bytes)".format(destination, len(data)))
+        return True
+
+    def write_files(self, file_list):
+        """
+        Upload all files in file_list in parallel.
+
+        returns list of failed (source, destination, error).
+        """
+        failed = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.parallel) as executor:
+            jobs = {
+                executor.submit(self.write_file, source, destination): (
+                    source,
+                    destination,
+                )
+                for source, destination in file_list
+            }
+            for job in concurrent.futures.as_completed(jobs):
+                try:
+                    job.result()
+                except OSError as e:
+                    failed.append(jobs[job] + (e,))
+        return failed
+
+
 ##########################################
 
 
@@ -57,7 +564,71 @@ class CPCopy:
         "COPY_AS_LIB_COMPILE": None,
         "COPY_COMPILE_ARDUINO_AS_UF2": None,
         "COPY_UF2": None,
+        "COPY_ASSETS": None,
+        "PULL": None,
+        "COMPILE_ARDUINO_PROFILES": None,
+    }
+
+    # board id (CircuitPython 'Board ID') → arduino / uf2 parameters
+    # https://github.com/microsoft/uf2/blob/master/utils/uf2families.json
+    # 'model' is matched against the 'Model:' line of INFO_UF2.TXT
+    BOARD_PROFILES = {
+        "adafruit_feather_esp32s3_reverse_tft": {
+            "model": "Feather ESP32-S3 Reverse TFT",
+            "fqbn": "esp32:esp32:adafruit_feather_esp32s3_reversetft",
+            "family": "ESP32S3",
+            "base_address": "0x0000",
+        },
+        "itsybitsy_m4_express": {
+            "model": "ItsyBitsy M4",
+            "fqbn": "adafruit:samd:adafruit_itsybitsy_m4",
+            "family": "SAMD51",
+            # 16kB bootloader
+            "base_address": "0x4000",
+        },
     }
+    FILENAME_PROJECT_CONFIG = "cp_copy.json"
+
+    SKETCH_SOURCE_SUFFIXES = (".ino", ".h", ".hpp", ".c", ".cpp", ".s")
+
+    # files and folders on the board that are never pulled.
+    PULL_IGNORE = [
+        "boot_out.txt",
+        "System Volume Information",
+    ]
+
+    # asset converters: source suffix → (function, destination suffix, version)
+    # increase the version when a converter changes - this invalidates its cache entries.
+    ASSET_CONVERTERS = {
+        ".bdf": None,
+        ".bmp": None,
+    }
+
+    TRANSPORT_DEFAULT = "disc"
+    TRANSPORTS = {
+        "disc": None,
+        "serial": None,
+        "web": None,
+    }
+
+    # written suffix → stale suffix that gets deleted on the board
+    STALE_SUFFIXES = {
+        ".mpy": ".py",
+    }
+    # only with --convert_assets: code has to load the converted files then.
+    STALE_SUFFIXES_CONVERTED = {
+        ".pcf": ".bdf",
+    }
+
+    # serial console markers
+    CONSOLE_BANNERS = (
+        "code.py output:",
+        "main.py output:",
+        "code.txt output:",
+        "main.txt output:",
+    )
+    CONSOLE_TRACEBACK = "Traceback (most recent call last):"
+    CONSOLE_DONE = "Code done running."
 
     VERBOSE_DEBUG = 2
 
@@ -77,7 +648,20 @@ class CPCopy:
         path_arduino="",
         path_uf2="",
         verbose=0,
-        path_target=None
+        path_target=None,
+        convert_assets=False,
+        display_depth=8,
+        jobs=None,
+        transport=TRANSPORT_DEFAULT,
+        serial_port=None,
+        web_host=None,
+        web_password="",
+        web_parallel=4,
+        monitor=False,
+        monitor_duration=10,
+        dry_run=False,
+        board=None,
+        boards=None
     ):
         """Init."""
         super()
@@ -97,14 +681,38 @@ class CPCopy:
         self.path_lib = "lib"
         self.path_arduino = path_arduino
         self.path_uf2 = path_uf2
-        if not path_target:
+        self.convert_assets = convert_assets
+        self.display_depth = display_depth
+        self.jobs = jobs
+        self.asset_missing_modules = set()
+        self.asset_lock = threading.Lock()
+        self.transport = transport
+        self.transport_backend = None
+        self.serial_port = serial_port
+        self.web_host = web_host
+        self.web_password = web_password
+        self.web_parallel = web_parallel
+        self.monitor = monitor
+        self.monitor_duration = monitor_duration
+        self.time_last_write = None
+        # None: action does not count written files (uf2 copy)
+        self.files_written = None
+        self.dry_run = dry_run
+        self.board = board
+        self.boards = boards
+        self.board_profiles = None
+        self.sketch_index = None
+        if self.transport != "disc":
+            # files are written relative to the board filesystem root.
+            self.path_target = path_target or "/"
+        elif not path_target:
             self.path_target = self.get_UF2_disc()
             print("self.path_target", self.path_target)
         else:
             self.path_target = path_target
 
         if self.check_for_arduino_file():
-            if self.action != "COPY_UF2":
+            if self.action not in ("COPY_UF2", "COMPILE_ARDUINO_PROFILES"):
                 # force action for arduino files
                 self.action = "COPY_COMPILE_ARDUINO_AS_UF2"
                 if self.verbose:
@@ -123,6 +731,18 @@ class CPCopy:
         self.ACTIONS["COPY_AS_LIB_COMPILE"] = self.copy_as_lib_mpy
         self.ACTIONS["COPY_COMPILE_ARDUINO_AS_UF2"] = self.copy_compile_arduino_as_uf2
         self.ACTIONS["COPY_UF2"] = self.copy_uf2
+        self.ACTIONS["COPY_ASSETS"] = self.copy_assets
+        self.ACTIONS["PULL"] = self.pull
+        self.ACTIONS["COMPILE_ARDUINO_PROFILES"] = self.compile_arduino_profiles
+
+        # create asset converter mapping
+        self.ASSET_CONVERTERS[".bdf"] = (self.asset_convert_bdf, ".pcf", "1")
+        self.ASSET_CONVERTERS[".bmp"] = (self.asset_convert_bmp, ".bmp", "2")
+
+        # create transport ~ function mapping
+        self.TRANSPORTS["disc"] = None
+        self.TRANSPORTS["serial"] = self.transport_create_serial
+        self.TRANSPORTS["web"] = self.transport_create_web
 
     ##########################################
     def process(self):
@@ -141,17 +761,26 @@ class CPCopy:
             self.prepare_paths()
         # elif self.action not "COPY_COMPILE_ARDUINO_AS_UF2":
         else:
-            if self.action != "COPY_COMPILE_ARDUINO_AS_UF2":
+            if self.action not in (
+                "COPY_COMPILE_ARDUINO_AS_UF2",
+                "COMPILE_ARDUINO_PROFILES",
+            ):
                 raise NotADirectoryError(
                     "no uf2 target disc found. " "is it mounted correctly? "
                 )
 
         try:
             # do action
-            action_function()  # noqa
+            self.transport_open()
+            try:
+                action_function()  # noqa
+            finally:
+                self.transport_close()
         except ValueError as error:
             # print(error)
-            if "arduino compilation failed!" in str(error):
+            if "arduino compilation failed!" in str(error) or (
+                "uf2 conversion failed!" in str(error)
+            ):
                 print(error)
             else:
                 raise error
@@ -160,7 +789,13 @@ class CPCopy:
             if self.verbose:
                 print("sync to disk...")
                 os.sync()
+            self.time_last_write = time.monotonic()
             print("done.")
+            if self.monitor and not self.dry_run:
+                if self.files_written == 0:
+                    print("monitor: skipped - nothing was written, so the board did not reload.")
+                else:
+                    self.monitor_console()
 
     def copy_as_main(self):
         """Copy as 'main.py'."""
@@ -201,6 +836,9 @@ class CPCopy:
     def copy_compile_arduino_as_uf2(self):
         """Compile Arduino Sketch, then convert to uf2 and copy to disc."""
         filenames = self.arduino_prepare_filenames()
+        if self.dry_run:
+            self.arduino_plan_print(filenames, profile=self.board_profile_get())
+            return
         # if self.verbose > 1:
         #     print("sketch_base_dir", filenames.sketch_base_dir)
         #     print("sketch_filename", filenames.sketch_filename)
@@ -245,6 +883,9 @@ class CPCopy:
     def copy_uf2(self):
         """copy uf2 to disc."""
         filenames = self.arduino_prepare_filenames()
+        if self.dry_run:
+            self.arduino_plan_print(filenames)
+            return
         # if self.verbose > 1:
         #     print("sketch_base_dir", filenames.sketch_base_dir)
         #     print("sketch_filename", filenames.sketch_filename)
@@ -279,6 +920,139 @@ class CPCopy:
         else:
             print("No Board found.")
 
+    def copy_assets(self):
+        """Convert assets and copy the whole cp_disc folder of the current file."""
+        if self.verbose and self.verbose >= self.VERBOSE_DEBUG:
+            print(self.copy_assets.__doc__)
+        section_root = self.path_find_target_section_root(self.filename_project)
+        if section_root is None:
+            raise NotADirectoryError(
+                "no target section folder found in '{}'. "
+                "(searched for {})".format(self.filename_project, self.PATH_PREFIX_LIST)
+            )
+
+        path_project_abs = os.path.abspath(self.path_project)
+        source_list = []
+        for dirpath, dirnames, filenames in os.walk(
+            os.path.join(path_project_abs, section_root)
+        ):
+            # skip hidden folders and python caches
+            dirnames[:] = sorted(
+                d for d in dirnames if not d.startswith(".") and d != "__pycache__"
+            )
+            for filename in sorted(filenames):
+                if filename.startswith("."):
+                    continue
+                source_list.append(
+                    os.path.relpath(os.path.join(dirpath, filename), path_project_abs)
+                )
+
+        file_list = []
+        for source in source_list:
+            destination = os.path.join(
+                self.path_target, self.path_strip_for_target_section(source)
+            )
+            file_list.append(
+                (os.path.join(path_project_abs, source), os.path.abspath(destination))
+            )
+        file_list = self.asset_prepare_list(file_list)
+
+        self.deploy(file_list)
+
+    def pull(self):
+        """Copy files changed on the board back to the project."""
+        if self.verbose and self.verbose >= self.VERBOSE_DEBUG:
+            print(self.pull.__doc__)
+        if self.transport_backend:
+            raise ValueError("action PULL is only supported with transport 'disc'.")
+        section_root = self.path_find_target_section_root(self.filename_project)
+        if section_root is None:
+            raise NotADirectoryError(
+                "no target section folder found in '{}'. "
+                "(searched for {})".format(self.filename_project, self.PATH_PREFIX_LIST)
+            )
+        path_section = os.path.join(os.path.abspath(self.path_project), section_root)
+
+        # inverse of path_strip_for_target_section: board path → project path
+        pairs = []
+        board_only = []
+        for dirpath, dirnames, filenames in os.walk(self.path_target):
+            dirnames[:] = sorted(
+                d
+                for d in dirnames
+                if not d.startswith(".") and d not in self.PULL_IGNORE
+            )
+            for filename in sorted(filenames):
+                if filename.startswith(".") or filename in self.PULL_IGNORE:
+                    continue
+                board_file = os.path.join(dirpath, filename)
+                relative = self.path_target_relative(board_file)
+                project_file = os.path.join(path_section, relative)
+                if os.path.isfile(project_file):
+                    pairs.append((relative, board_file, project_file))
+                else:
+                    board_only.append(relative)
+
+        # hash both sides in parallel
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            hashes_board = executor.map(file_hash, [b for _, b, _ in pairs])
+            hashes_project = executor.map(file_hash, [p for _, _, p in pairs])
+            hashes = list(zip(hashes_board, hashes_project))
+
+        manifest = self.deploy_manifest_load()
+        board_known = manifest is not None
+        if not board_known:
+            print("board has no UID in boot_out.txt - all differences are conflicts.")
+            manifest = {}
+        pull_list = []
+        conflicts = []
+        project_newer = []
+        for (relative, board_file, project_file), (hash_board, hash_project) in zip(
+            pairs, hashes
+        ):
+            if hash_board == hash_project:
+                continue
+            hash_deployed = manifest.get(relative)
+            if not board_known or hash_deployed is None:
+                # no record of what was deployed - we can not tell which side changed.
+                conflicts.append((relative, board_file, project_file))
+            elif hash_project == hash_deployed:
+                pull_list.append((relative, board_file, project_file, hash_board))
+            elif hash_board == hash_deployed:
+                project_newer.append(relative)
+            else:
+                conflicts.append((relative, board_file, project_file))
+
+        print("*" * 42)
+        print("pull from '{}' to '{}':".format(self.path_target, path_section))
+        print("  compared:      {} files".format(len(pairs)))
+        print("  pull:          {} files".format(len(pull_list)))
+        for relative, _, _, _ in pull_list:
+            print("    '{}'".format(relative))
+        print("  project newer: {} files (not pulled)".format(len(project_newer)))
+        if self.verbose:
+            for relative in project_newer:
+                print("    '{}'".format(relative))
+        print("  board only:    {} files (not pulled)".format(len(board_only)))
+        if self.verbose:
+            for relative in board_only:
+                print("    '{}'".format(relative))
+        print(
+            "  CONFLICTS:     {} files "
+            "(changed on both sides or not deployed with this helper)".format(len(conflicts))
+        )
+        for relative, board_file, project_file in conflicts:
+            print("    '{}' ↔ '{}'".format(board_file, project_file))
+        print("*" * 42)
+        if self.dry_run:
+            return
+
+        hashes_pulled = {}
+        for relative, board_file, project_file, hash_board in pull_list:
+            if self.copy_file(board_file, project_file) is not None:
+                hashes_pulled[relative] = hash_board
+        self.deploy_manifest_update(hashes_pulled)
+
     ##########################################
     def copy_w_options(
         self, *, destination_filename=None, compile_to_mpy=False, lib=False  # noqa
@@ -305,13 +1079,22 @@ class CPCopy:
                 )
         destination_abs = os.path.abspath(destination)
 
+        if self.convert_assets:
+            [(source_abs, destination_abs)] = self.asset_prepare_list(
+                [(source_abs, destination_abs)]
+            )
+
         if self.verbose > self.VERBOSE_DEBUG:
             print(source_abs)
             print(destination_abs)
-        self.copy_file(source_abs, destination_abs)
+        # always write the named file - re-copying triggers the auto reload.
+        self.deploy([(source_abs, destination_abs)], force=True)
 
     def copy_file(self, source, destination):
         """Copy file."""
+        if self.transport_backend:
+            return self.copy_file_transport(source, destination)
+
         command = [
             "cp",
             "--verbose",
@@ -340,6 +1123,611 @@ class CPCopy:
                 print("copy file done.")
         return result
 
+    def copy_file_transport(self, source, destination):
+        """Copy file with the selected transport."""
+        if self.copy_files_transport([(source, destination)]):
+            return None
+        return destination
+
+    def copy_files(self, file_list):
+        """
+        Copy all files in file_list. (transports can do this in parallel)
+
+        returns list of failed (source, destination, error).
+        """
+        if self.transport_backend:
+            return self.copy_files_transport(file_list)
+        failed = []
+        for source, destination in file_list:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            if self.copy_file(source, destination) is None:
+                failed.append((source, destination, None))
+        return failed
+
+    def copy_files_transport(self, file_list):
+        """Copy files with the selected transport. returns list of failed files."""
+        if self.verbose:
+            for source, destination in file_list:
+                print("{}: '{}' → '{}'".format(self.transport, source, destination))
+        failed = self.transport_backend.write_files(file_list)
+        for source, destination, error in failed:
+            print("failed: {}".format(error))
+        if self.verbose and not failed:
+            print("copy file done.")
+        return failed
+
+    ##########################################
+
+    def deploy(self, file_list, force=False):
+        """
+        Plan, check free space and copy files (or only print plan on dry run).
+
+        force: write all files - even if they are unchanged on the target.
+        """
+        plan = self.deploy_plan(file_list, force=force)
+        if self.dry_run or self.verbose:
+            self.deploy_plan_print(plan)
+        if self.dry_run:
+            return
+        if plan["bytes_free"] is not None and plan["bytes_needed"] > plan["bytes_free"]:
+            raise OSError(
+                errno.ENOSPC,
+                "not enough free space on '{}': needs {} bytes, {} bytes free. "
+                "nothing was copied.".format(
+                    self.path_target, plan["bytes_needed"], plan["bytes_free"]
+                ),
+            )
+
+        time_start = time.monotonic()
+        for destination in plan["delete"]:
+            if self.verbose:
+                print("delete '{}'".format(destination))
+            self.target_delete_file(destination)
+        failed = self.copy_files(
+            [(source, destination) for source, destination, _ in plan["write"]]
+        )
+        if self.files_written is None:
+            self.files_written = 0
+        if not self.transport_backend and plan["write"]:
+            os.sync()
+        self.files_written += len(plan["write"]) - len(failed)
+        if plan["write"]:
+            self.throughput_record(plan["bytes_write"], time.monotonic() - time_start)
+
+        # remember what was deployed - needed to detect conflicts on PULL.
+        failed_destinations = set(destination for _, destination, _ in failed)
+        file_list_done = [
+            (source, destination)
+            for source, destination, _ in plan["write"]
+            if destination not in failed_destinations
+        ] + plan["skip"]
+        self.deploy_manifest_update(
+            dict(
+                (self.path_target_relative(destination), file_hash(source))
+                for source, destination in file_list_done
+            ),
+            [self.path_target_relative(destination) for destination in plan["delete"]],
+        )
+
+    def path_target_relative(self, destination):
+        """Get destination relative to path_target. (posix style)"""
+        return pathlib.Path(os.path.relpath(destination, self.path_target)).as_posix()
+
+    def board_uid(self):
+        """Get id of the physical board. (None if unknown)"""
+        if self.transport == "web":
+            # the default hostname is derived from the board UID.
+            return self.web_host
+        if self.transport == "serial":
+            if not self.transport_backend:
+                return None
+            return self.transport_backend.board_uid()
+        return self.board_info_read().get("uid")
+
+    def deploy_manifest_filename(self):
+        """Get filename of the deploy manifest for the current board. (None if unknown)"""
+        uid = self.board_uid()
+        if not uid:
+            return None
+        name = "".join(c if c.isalnum() or c in "-_." else "_" for c in uid)
+        return os.path.join(get_cache_dir("deploy"), name + ".json")
+
+    def deploy_manifest_load(self):
+        """
+        Load deploy manifest. (path relative to board → sha256)
+
+        returns None if the board can not be identified.
+        """
+        filename = self.deploy_manifest_filename()
+        if not filename:
+            return None
+        try:
+            with open(filename) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def deploy_manifest_update(self, hashes, removed=()):
+        """Update deploy manifest with hashes and remove deleted files."""
+        manifest = self.deploy_manifest_load()
+        if manifest is None:
+            if self.verbose:
+                print("board has no UID - deploy is not recorded.")
+            return
+        manifest.update(hashes)
+        for path in removed:
+            manifest.pop(path, None)
+        with open(self.deploy_manifest_filename(), "w") as f:
+            json.dump(manifest, f, indent=4, sort_keys=True)
+
+    def deploy_plan(self, file_list, force=False):
+        """Compute what needs to be written, skipped and deleted."""
+        plan = {
+            "write": [],
+            "skip": [],
+            "delete": [],
+            "delete_reasons": {},
+            "bytes_write": 0,
+            "bytes_needed": 0,
+            "bytes_free": None,
+            "duration_estimate": None,
+        }
+        free_space = self.target_free_space()
+        cluster_size = 512
+        if free_space:
+            plan["bytes_free"], cluster_size = free_space
+
+        def cluster_rounded(size):
+            return -(-size // cluster_size) * cluster_size
+
+        destinations = set(destination for _, destination in file_list)
+        dirs_missing = set()
+        for source, destination in file_list:
+            size_old = self.target_file_size(destination)
+            if (
+                not force
+                and size_old is not None
+                and self.target_is_unchanged(source, destination)
+            ):
+                plan["skip"].append((source, destination))
+                continue
+            size = os.path.getsize(source)
+            plan["write"].append((source, destination, size))
+            plan["bytes_write"] += size
+            plan["bytes_needed"] += cluster_rounded(size) - cluster_rounded(size_old or 0)
+            directory = os.path.dirname(destination)
+            if not self.transport_backend and not os.path.isdir(directory):
+                dirs_missing.add(directory)
+            # stale files (for example 'lib/x.py' would shadow 'lib/x.mpy')
+            root, suffix = os.path.splitext(destination)
+            stale_suffixes = dict(self.STALE_SUFFIXES)
+            if self.convert_assets:
+                stale_suffixes.update(self.STALE_SUFFIXES_CONVERTED)
+            if suffix in stale_suffixes:
+                stale = root + stale_suffixes[suffix]
+                size_stale = None
+                if stale not in destinations:
+                    size_stale = self.target_file_size(stale)
+                if size_stale is not None:
+                    plan["delete"].append(stale)
+                    plan["delete_reasons"][stale] = "replaced by '{}'{}".format(
+                        os.path.basename(destination),
+                        " (--convert_assets)" if suffix in self.STALE_SUFFIXES_CONVERTED else "",
+                    )
+                    plan["bytes_needed"] -= cluster_rounded(size_stale)
+        # every new folder needs at least one cluster.
+        plan["bytes_needed"] += len(dirs_missing) * cluster_size
+
+        throughput = self.throughput_get()
+        if throughput:
+            plan["duration_estimate"] = plan["bytes_write"] / throughput
+        return plan
+
+    def deploy_plan_print(self, plan):
+        """Print deploy plan."""
+        print("*" * 42)
+        print("plan for '{}':".format(self.path_target))
+        print(
+            "  write:  {} files, {} bytes "
+            "({} bytes needed incl. cluster rounding)".format(
+                len(plan["write"]), plan["bytes_write"], plan["bytes_needed"]
+            )
+        )
+        if self.dry_run or (self.verbose and self.verbose >= self.VERBOSE_DEBUG):
+            for source, destination, size in plan["write"]:
+                print("    '{}' ({} bytes)".format(destination, size))
+        print("  skip:   {} files (unchanged)".format(len(plan["skip"])))
+        print("  delete: {} files".format(len(plan["delete"])))
+        for destination in plan["delete"]:
+            print("    '{}' - {}".format(destination, plan["delete_reasons"][destination]))
+        if plan["bytes_free"] is None:
+            print("  free:   unknown")
+        else:
+            print(
+                "  free:   {} bytes → {}".format(
+                    plan["bytes_free"],
+                    "ok" if plan["bytes_needed"] <= plan["bytes_free"] else "NOT ENOUGH",
+                )
+            )
+        if plan["duration_estimate"] is None:
+            print("  estimated duration: unknown (no previous runs for this board)")
+        else:
+            print("  estimated duration: {:.1f}s".format(plan["duration_estimate"]))
+        print("*" * 42)
+
+    def target_file_size(self, destination):
+        """Get size of file on target. (None if it does not exist)"""
+        if self.transport_backend:
+            return self.transport_backend.file_size(destination)
+        if not os.path.isfile(destination):
+            return None
+        return os.path.getsize(destination)
+
+    def target_is_unchanged(self, source, destination):
+        """Check if file on target has same content as source."""
+        if self.transport_backend:
+            return self.transport_backend.is_unchanged(source, destination)
+        return filecmp.cmp(source, destination, shallow=False)
+
+    def target_delete_file(self, destination):
+        """Delete file on target."""
+        if self.transport_backend:
+            self.transport_backend.delete_file(destination)
+        else:
+            os.remove(destination)
+
+    def target_free_space(self):
+        """Get (bytes free, cluster size) of target. (None if unknown)"""
+        if self.transport_backend:
+            return self.transport_backend.free_space()
+        try:
+            stat = os.statvfs(self.path_target)
+        except OSError:
+            return None
+        return stat.f_bavail * stat.f_frsize, stat.f_frsize
+
+    def board_key(self):
+        """Get a name that identifies the current board."""
+        if self.transport == "web":
+            return self.web_host
+        if self.transport == "serial":
+            return self.serial_port
+        board_id = self.board_info_read().get("board_id")
+        if board_id:
+            return board_id
+        return os.path.basename(os.path.normpath(self.path_target))
+
+    def throughput_history_load(self):
+        """Load throughput history. (board → list of [bytes, duration])"""
+        try:
+            with open(os.path.join(get_cache_dir(), "throughput.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def throughput_get(self):
+        """Get average throughput (bytes/s) of previous runs for the current board."""
+        history = self.throughput_history_load().get(self.board_key(), [])
+        duration = sum(entry[1] for entry in history)
+        if not duration:
+            return None
+        return sum(entry[0] for entry in history) / duration
+
+    def throughput_record(self, bytes_written, duration):
+        """Add measurement to throughput history (last 10 runs per board)."""
+        if not bytes_written or duration <= 0:
+            return
+        history = self.throughput_history_load()
+        key = self.board_key()
+        history[key] = (history.get(key, []) + [[bytes_written, duration]])[-10:]
+        with open(os.path.join(get_cache_dir(), "throughput.json"), "w") as f:
+            json.dump(history, f, indent=4)
+        if self.verbose:
+            print(
+                "throughput: {} bytes in {:.2f}s ({:.1f}kB/s)".format(
+                    bytes_written, duration, bytes_written / 1024 / duration
+                )
+            )
+
+    ##########################################
+
+    def transport_open(self):
+        """Create and open transport backend (if not 'disc')."""
+        create_function = self.TRANSPORTS[self.transport]
+        if create_function:
+            self.transport_backend = create_function()
+            self.transport_backend.open()
+
+    def transport_close(self):
+        """Close transport backend."""
+        if self.transport_backend:
+            self.transport_backend.close()
+            self.transport_backend = None
+
+    def transport_create_serial(self):
+        """Create serial raw REPL transport."""
+        if not self.serial_port:
+            raise ValueError("transport 'serial' needs a serial port. (--serial_port)")
+        return SerialREPLTransport(self.serial_port, verbose=self.verbose)
+
+    def transport_create_web(self):
+        """Create web workflow transport."""
+        if not self.web_host:
+            raise ValueError("transport 'web' needs a host. (--web_host)")
+        return WebWorkflowTransport(
+            self.web_host,
+            password=self.web_password,
+            parallel=self.web_parallel,
+            verbose=self.verbose,
+        )
+
+    ##########################################
+
+    def asset_prepare_list(self, file_list):
+        """
+        Convert all assets in file_list.
+
+        conversion runs in parallel (worker pool) and uses a content-addressed cache.
+        returns the file_list with sources and destinations
+        replaced by the converted files.
+        """
+        result = list(file_list)
+        jobs = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            for index, (source, destination) in enumerate(file_list):
+                suffix = os.path.splitext(source)[1].lower()
+                if suffix in self.ASSET_CONVERTERS:
+                    jobs[executor.submit(self.asset_convert, source)] = index
+            for job in concurrent.futures.as_completed(jobs):
+                index = jobs[job]
+                source, destination = file_list[index]
+                converted = job.result()
+                if converted:
+                    destination_root = os.path.splitext(destination)[0]
+                    destination_suffix = os.path.splitext(converted)[1]
+                    result[index] = (converted, destination_root + destination_suffix)
+        return result
+
+    def asset_convert(self, source):
+        """
+        Convert asset (with cache).
+
+        returns filename of the converted file or None if no conversion is needed.
+        """
+        suffix = os.path.splitext(source)[1].lower()
+        function, destination_suffix, version = self.ASSET_CONVERTERS[suffix]
+        hash_obj = hashlib.sha256()
+        hash_obj.update(file_hash(source).encode())
+        hash_obj.update(
+            "{}:{}:{}:{}".format(
+                suffix, function.__name__, version, self.display_depth
+            ).encode()
+        )
+        cache_filename = os.path.join(
+            get_cache_dir("assets"), hash_obj.hexdigest() + destination_suffix
+        )
+        # an empty cache file marks 'no conversion needed'
+        if os.path.exists(cache_filename):
+            if self.verbose and self.verbose >= self.VERBOSE_DEBUG:
+                print("asset cache hit: '{}'".format(source))
+        else:
+            fd, cache_filename_temp = tempfile.mkstemp(
+                suffix=destination_suffix, dir=os.path.dirname(cache_filename)
+            )
+            os.close(fd)
+            try:
+                converted = function(source, cache_filename_temp)
+                if not converted:
+                    open(cache_filename_temp, "wb").close()
+                os.chmod(cache_filename_temp, 0o644)
+                os.replace(cache_filename_temp, cache_filename)
+            except ImportError as e:
+                # optional dependency (Pillow) missing - copy the original.
+                with self.asset_lock:
+                    if e.name not in self.asset_missing_modules:
+                        self.asset_missing_modules.add(e.name)
+                        print(
+                            "asset conversion needs python module '{}' "
+                            "- copying originals.".format(e.name)
+                        )
+                return None
+            except (subprocess.CalledProcessError, OSError) as e:
+                # failed conversions are not cached - copy the original.
+                print("asset conversion failed for '{}': {}".format(source, e))
+                return None
+            finally:
+                if os.path.exists(cache_filename_temp):
+                    os.remove(cache_filename_temp)
+            if self.verbose:
+                print("asset converted: '{}'".format(source))
+        if os.path.getsize(cache_filename) == 0:
+            return None
+        return cache_filename
+
+    def asset_convert_bdf(self, source, destination):
+        """Convert BDF font to PCF."""
+        command = [
+            "bdftopcf",
+            "-o",
+            destination,
+            source,
+        ]
+        if self.verbose and self.verbose >= self.VERBOSE_DEBUG:
+            print("command:{}".format(" ".join(command)))
+        subprocess.check_output(command)
+        return True
+
+    def asset_convert_bmp(self, source, destination):
+        """
+        Convert BMP to display_depth (if needed).
+
+        up to 8 bits: palettize, 16 bits: RGB565, above: keep as is.
+        """
+        if self.display_depth > 16:
+            return False
+        if self.display_depth > 8:
+            with open(source, "rb") as f:
+                header = f.read(30)
+            if len(header) == 30 and struct.unpack_from("<H", header, 28)[0] <= 16:
+                # already 16 bits or less.
+                return False
+            return self.asset_write_bmp_rgb565(source, destination)
+        from PIL import Image
+
+        colors = 2**self.display_depth
+        with Image.open(source) as image:
+            if image.mode in ("1", "P", "L") and image.getcolors(colors) is not None:
+                # already indexed with a small enough palette.
+                return False
+            image.convert("RGB").quantize(colors=colors).save(destination, "BMP")
+        return True
+
+    def asset_write_bmp_rgb565(self, source, destination):
+        """Write BMP as 16bit RGB565 (BI_BITFIELDS) - as displayio.OnDiskBitmap reads it."""
+        from PIL import Image
+
+        with Image.open(source) as image:
+            image = image.convert("RGB")
+            width, height = image.size
+            data = image.tobytes()
+        row_size = (width * 2 + 3) & ~3
+        padding = b"\x00" * (row_size - width * 2)
+        header_size = 14 + 40 + 12
+        with open(destination, "wb") as f:
+            # file header
+            f.write(
+                struct.pack("<2sIHHI", b"BM", header_size + row_size * height, 0, 0, header_size)
+            )
+            # BITMAPINFOHEADER with compression 3 (BI_BITFIELDS) and RGB565 masks
+            f.write(
+                struct.pack(
+                    "<IiiHHIIiiII", 40, width, height, 1, 16, 3, row_size * height, 2835, 2835, 0, 0
+                )
+            )
+            f.write(struct.pack("<III", 0xF800, 0x07E0, 0x001F))
+            # rows bottom up
+            for y in range(height - 1, -1, -1):
+                row = data[y * width * 3 : (y + 1) * width * 3]
+                pixels = [
+                    ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+                    for r, g, b in zip(row[0::3], row[1::3], row[2::3])
+                ]
+                f.write(struct.pack("<{}H".format(width), *pixels) + padding)
+        return True
+
+    ##########################################
+
+    def serial_port_find(self):
+        """Find serial console of the board."""
+        if self.serial_port:
+            return self.serial_port
+        import serial.tools.list_ports
+
+        ports = serial.tools.list_ports.comports()
+        for port in ports:
+            if "CircuitPython" in "{} {}".format(port.product, port.description):
+                return port.device
+        for port in ports:
+            # Adafruit USB vendor ID
+            if port.vid == 0x239A:
+                return port.device
+        return None
+
+    def monitor_console(self):
+        """Show serial console output and measure deploy to first output latency."""
+        if self.transport == "web" and not self.serial_port:
+            print(
+                "monitor: skipped - transport 'web' has no serial console. "
+                "use --serial_port to monitor anyway."
+            )
+            return
+        import serial
+
+        port = self.serial_port_find()
+        if not port:
+            print("monitor: no serial console of a CircuitPython board found.")
+            return
+        print("*" * 42)
+        print("monitor '{}' for {}s (CTRL-C to stop)".format(port, self.monitor_duration))
+        result = {
+            "latency_banner": None,
+            "latency_output": None,
+            "traceback": False,
+        }
+        banner_found = False
+        code_done = False
+        buffer = b""
+        try:
+            with serial.serial_for_url(port, baudrate=115200, timeout=0.1) as console:
+                while (
+                    not code_done
+                    and (time.monotonic() - self.time_last_write) < self.monitor_duration
+                ):
+                    buffer += console.read(console.in_waiting or 1)
+                    lines = buffer.split(b"\n")
+                    buffer = lines.pop()
+                    for line in lines:
+                        line = line.decode(errors="replace").rstrip("\r")
+                        latency = time.monotonic() - self.time_last_write
+                        print("[{:7.3f}s] {}".format(latency, line))
+                        if line.startswith(self.CONSOLE_BANNERS):
+                            banner_found = True
+                            if result["latency_banner"] is None:
+                                result["latency_banner"] = latency
+                        elif (
+                            banner_found
+                            and line.strip()
+                            and result["latency_output"] is None
+                        ):
+                            result["latency_output"] = latency
+                        if self.CONSOLE_TRACEBACK in line:
+                            result["traceback"] = True
+                        if banner_found and self.CONSOLE_DONE in line:
+                            code_done = True
+        except KeyboardInterrupt:
+            print()
+            print("monitor stopped by KeyboardInterrupt.")
+        except serial.serialutil.SerialException as e:
+            print("monitor: SerialException: ", e)
+        print("*" * 42)
+        if result["traceback"]:
+            print("monitor: traceback detected!")
+        if result["latency_output"] is None:
+            print("monitor: no program output detected.")
+        else:
+            print(
+                "deploy to first output latency: {:.3f}s".format(result["latency_output"])
+            )
+        self.monitor_record_latency(result)
+
+    def monitor_record_latency(self, result):
+        """Append latency result to history file and print history average."""
+        record = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "target": self.web_host or self.serial_port or self.path_target,
+            "transport": self.transport,
+            "action": self.action,
+            "filename_project": self.filename_project,
+        }
+        record.update(result)
+        history_filename = os.path.join(get_cache_dir(), "latency.jsonl")
+        with open(history_filename, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        with open(history_filename) as f:
+            history = [json.loads(line) for line in f if line.strip()]
+        latencies = [
+            entry["latency_output"]
+            for entry in history
+            if entry["target"] == record["target"]
+            and entry.get("latency_output") is not None
+        ][-10:]
+        if latencies:
+            print(
+                "latency average of last {} deploys: {:.3f}s  (history: {})".format(
+                    len(latencies), sum(latencies) / len(latencies), history_filename
+                )
+            )
+
     ##########################################
 
     def check_for_arduino_file(self):
@@ -356,7 +1744,7 @@ class CPCopy:
                 result = "subfile"
         return result
 
-    def arduino_prepare_filenames(self):
+    def arduino_prepare_filenames(self, build_dir="build"):
         # print("self.filename_project", self.filename_project)
         # sketch_base_dir = os.path.dirname(self.filename_project)
         # # print("sketch_base_dir", sketch_base_dir)
@@ -376,36 +1764,37 @@ class CPCopy:
                 print("   sketch_base_dir:", sketch_base_dir)
                 print("   self.filename_project:", self.filename_project)
                 print("   sketch_filename:", sketch_filename)
-        if sketch_filename.endswith("h") or sketch_filename.endswith("cpp"):
+        is_subfile = not sketch_filename.endswith("ino")
+        if is_subfile:
             print("searching for main arduino sketch entry point...")
-            # sketch_filename
-            # sketch_base_dir
-            head, tail = os.path.split(sketch_base_dir)
-            if not tail:
-                head, tail = os.path.split(head)
-            # print("tail", tail)
-            # print("head", head)
-            # hopefully tail now contains the project folder name
-            prj_folder_name = tail
-            if prj_folder_name:
-                sketch_filename = prj_folder_name + ".ino"
-            else:
-                print("error: not able to find arduino sketch entry point.")
-            if not os.path.exists(sketch_filename):
-                raise "error: not able to find arduino sketch entry point."
+        sketch_dir = self.sketch_index_resolve(
+            os.path.join(sketch_base_dir, self.filename_project)
+        )
+        if sketch_dir:
+            sketch_base_dir = sketch_dir
+            sketch_filename = os.path.basename(sketch_dir) + ".ino"
+        elif is_subfile:
+            raise ValueError(
+                "error: not able to find arduino sketch entry point for '{}'. "
+                "(no folder with matching .ino file found)".format(self.filename_project)
+            )
+        if is_subfile:
             print(
-                "done. we have the main entry point found: '{}'".format(sketch_filename)
+                "done. we have the main entry point found: '{}'".format(
+                    os.path.join(sketch_base_dir, sketch_filename)
+                )
             )
 
         filename_root = os.path.splitext(sketch_filename)[0]
         filename_uf2 = filename_root + ".uf2"
         filename_bin = sketch_filename + ".bin"
         filename_elf = sketch_filename + ".elf"
-        full_filename_bin = os.path.join("build", filename_bin)
-        full_filename_elf = os.path.join("build", filename_elf)
-        full_filename_uf2 = os.path.join("build", filename_uf2)
+        full_filename_bin = os.path.join(build_dir, filename_bin)
+        full_filename_elf = os.path.join(build_dir, filename_elf)
+        full_filename_uf2 = os.path.join(build_dir, filename_uf2)
         result = {
             "sketch_base_dir": sketch_base_dir,
+            "build_dir": build_dir,
             "sketch_filename": sketch_filename,
             "filename_root": filename_root,
             "filename_uf2": filename_uf2,
@@ -421,36 +1810,205 @@ class CPCopy:
                 pp.pprint(result)
         return result
 
-    def arduino_compile_to_uf2(self, filenames):
-        """Compile arduino sketch and convert to uf2."""
-        with cd(filenames["sketch_base_dir"]):
-            if self.verbose:
-                print("*" * 42)
-                print("compile arduino sketch")
-            compile_result = self.compile_arduino_sketch(
-                source=filenames["sketch_filename"], path_arduino=self.path_arduino
+    def sketch_index_filename(self, workspace):
+        """Get filename of the persisted sketch index for workspace."""
+        name = hashlib.sha256(workspace.encode()).hexdigest()[:16]
+        return os.path.join(get_cache_dir("sketch_index"), name + ".json")
+
+    def sketch_index_build(self, workspace):
+        """
+        Scan workspace for sketch roots and map all source files to their sketch.
+
+        a sketch root is a folder that contains a .ino file with the folder name.
+        files belong to the nearest sketch root above them.
+        """
+        if self.verbose:
+            print("indexing arduino sketches in '{}'...".format(workspace))
+        dirs = {}
+        sketch_roots = set()
+        source_files = []
+        for dirpath, dirnames, filenames in os.walk(workspace):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "build"]
+            relative_dir = pathlib.Path(os.path.relpath(dirpath, workspace)).as_posix()
+            dirs[relative_dir] = os.stat(dirpath).st_mtime_ns
+            if os.path.basename(dirpath) + ".ino" in filenames:
+                sketch_roots.add(relative_dir)
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() in self.SKETCH_SOURCE_SUFFIXES:
+                    source_files.append(pathlib.PurePosixPath(relative_dir, filename))
+
+        files = {}
+        for source_file in source_files:
+            files[source_file.as_posix()] = None
+            for parent in source_file.parents:
+                if parent.as_posix() in sketch_roots:
+                    files[source_file.as_posix()] = parent.as_posix()
+                    break
+        index = {
+            "workspace": workspace,
+            "dirs": dirs,
+            "files": files,
+        }
+        with open(self.sketch_index_filename(workspace), "w") as f:
+            json.dump(index, f)
+        return index
+
+    def sketch_index_valid(self, index, workspace, relative_file):
+        """Check that index is up to date for relative_file. (folder mtimes)"""
+        if relative_file not in index["files"]:
+            return False
+        for parent in pathlib.PurePosixPath(relative_file).parents:
+            try:
+                mtime = os.stat(os.path.join(workspace, parent)).st_mtime_ns
+            except OSError:
+                return False
+            if index["dirs"].get(parent.as_posix()) != mtime:
+                return False
+        return True
+
+    def sketch_index_resolve(self, filename):
+        """Get sketch root folder for filename. (None if it does not belong to a sketch)"""
+        workspace = os.path.abspath(self.path_project)
+        relative_file = pathlib.Path(os.path.relpath(filename, workspace)).as_posix()
+        if relative_file.startswith("../"):
+            return None
+        index = self.sketch_index
+        if index is None or index["workspace"] != workspace:
+            try:
+                with open(self.sketch_index_filename(workspace)) as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = None
+        if index is None or not self.sketch_index_valid(index, workspace, relative_file):
+            index = self.sketch_index_build(workspace)
+        self.sketch_index = index
+        sketch_root = index["files"].get(relative_file)
+        if sketch_root is None:
+            return None
+        return os.path.normpath(os.path.join(workspace, sketch_root))
+
+    def arduino_plan_print(self, filenames, profile=None):
+        """Print what the arduino actions would do. (dry run)"""
+        print("*" * 42)
+        print("plan:")
+        print(
+            "  sketch:  '{}'".format(
+                os.path.join(filenames["sketch_base_dir"], filenames["sketch_filename"])
             )
-            # print(compile_result)
-            if compile_result:
-                raise ValueError("arduino compilation failed!")
+        )
+        if profile:
+            print("  compile: {}".format(profile))
+        print(
+            "  uf2:     '{}'".format(
+                os.path.join(filenames["sketch_base_dir"], filenames["full_filename_uf2"])
+            )
+        )
+        if self.path_target:
+            print("  copy to: '{}'".format(self.path_target))
+        else:
+            print("  copy to: uf2 bootloader disc (not mounted)")
+        print("*" * 42)
 
-            if self.verbose:
-                print("*" * 42)
-                print("convert to uf2")
-            self.convert_to_uf2(
-                source=filenames["full_filename_bin"],
-                # source=filenames["full_filename_elf"],
-                destination=filenames["full_filename_uf2"],
-                path_uf2=self.path_uf2,
-                # https://github.com/microsoft/uf2/blob/master/utils/uf2families.json
-                # # base_address defaults to 16Byte bootloader (ItsyBitsy M4)
-                # base_address="0x4000",
-                # family="SAMD51",
-                base_address="0x0000",
-                family="ESP32S3",
-            )
-
-    def compile_arduino_sketch(self, source, path_arduino=""):
+    def arduino_compile_to_uf2(self, filenames, profile=None, build_path=None):
+        """Compile arduino sketch and convert to uf2."""
+        if profile is None:
+            profile = self.board_profile_get()
+        if self.verbose:
+            print("*" * 42)
+            print("compile arduino sketch")
+        compile_result = self.compile_arduino_sketch(
+            source=filenames["sketch_filename"],
+            path_arduino=self.path_arduino,
+            fqbn=profile["fqbn"],
+            output_dir=filenames["build_dir"],
+            build_path=build_path,
+            cwd=filenames["sketch_base_dir"],
+        )
+        # print(compile_result)
+        if compile_result:
+            raise ValueError("arduino compilation failed!")
+
+        if self.verbose:
+            print("*" * 42)
+            print("convert to uf2")
+        convert_result = self.convert_to_uf2(
+            source=filenames["full_filename_bin"],
+            # source=filenames["full_filename_elf"],
+            destination=filenames["full_filename_uf2"],
+            path_uf2=self.path_uf2,
+            base_address=profile["base_address"],
+            family=profile["family"],
+            cwd=filenames["sketch_base_dir"],
+        )
+        if convert_result is None:
+            raise ValueError("uf2 conversion failed!")
+
+    def compile_arduino_profiles(self):
+        """Compile Arduino Sketch and convert to uf2 for several board profiles in parallel."""
+        profiles = self.board_profiles_load()
+        boards = self.boards or self.project_config_load().get("board_profiles", {}).keys()
+        boards = list(boards)
+        if not boards:
+            raise ValueError(
+                "no board profiles to build. "
+                "use --boards or add 'board_profiles' to '{}'.".format(
+                    self.FILENAME_PROJECT_CONFIG
+                )
+            )
+        unknown = [board for board in boards if board not in profiles]
+        if unknown:
+            raise ValueError("unknown board profiles: {}".format(", ".join(unknown)))
+        if not self.path_arduino.endswith("arduino-cli"):
+            raise ValueError("building several profiles needs arduino-cli. (--path_arduino)")
+
+        if self.dry_run:
+            for board in boards:
+                self.arduino_plan_print(
+                    self.arduino_prepare_filenames(build_dir=os.path.join("build", board)),
+                    profile=profiles[board],
+                )
+            return
+
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            jobs = {}
+            for board in boards:
+                build_dir = os.path.join("build", board)
+                filenames = self.arduino_prepare_filenames(build_dir=build_dir)
+                job = executor.submit(
+                    self.arduino_compile_to_uf2,
+                    filenames,
+                    profile=profiles[board],
+                    # separate build folders - otherwise parallel builds clash.
+                    build_path=os.path.join(build_dir, "cache"),
+                )
+                jobs[job] = (board, filenames)
+            for job in concurrent.futures.as_completed(jobs):
+                board, filenames = jobs[job]
+                try:
+                    job.result()
+                except ValueError as error:
+                    results[board] = "failed: {}".format(error)
+                else:
+                    results[board] = os.path.join(
+                        filenames["sketch_base_dir"], filenames["full_filename_uf2"]
+                    )
+        print("*" * 42)
+        for board in boards:
+            print("{}: {}".format(board, results[board]))
+        print("*" * 42)
+        if any(result.startswith("failed") for result in results.values()):
+            raise ValueError("arduino compilation failed! (see above)")
+
+    def compile_arduino_sketch(
+        self,
+        source,
+        path_arduino="",
+        fqbn=None,
+        output_dir="build",
+        build_path=None,
+        cwd=None,
+    ):
         """Compile arduino sketch."""
         if "arduino-ide" in path_arduino:
             raise "arduino-ide path given. currently not implemented. please use old arduino or use arduino-cli"
@@ -465,17 +2023,18 @@ class CPCopy:
             command = [
                 script,
                 "compile",
-                "--fqbn=esp32:esp32:adafruit_feather_esp32s3_reversetft",
-                # "--build-path=build",
-                "--output-dir=build",
+                "--fqbn=" + fqbn,
+                "--output-dir=" + output_dir,
                 # "--verbose",
                 source,
             ]
+            if build_path:
+                command.insert(-1, "--build-path=" + build_path)
         else:
             command = [
                 script,
                 "--pref",
-                "build.path=build",
+                "build.path=" + output_dir,
                 "--verify",
                 "--verbose",
                 source,
@@ -487,7 +2046,7 @@ class CPCopy:
             if self.verbose and self.verbose >= self.VERBOSE_DEBUG:
                 print("command:{}".format(" ".join(command)))
             print("", flush=True)
-            result = subprocess.check_output(command, universal_newlines=True)
+            result = subprocess.check_output(command, universal_newlines=True, cwd=cwd)
         except subprocess.CalledProcessError as error:
             # print("error handling...")
             print("*" * 42)
@@ -516,6 +2075,7 @@ class CPCopy:
         path_uf2="",
         base_address="0x4000",
         family="SAMD51",
+        cwd=None,
     ):
         """Convert to uf2."""
         script = os.path.join(path_uf2, "uf2conv.py")
@@ -538,7 +2098,7 @@ class CPCopy:
                 print("command:{}".format(" ".join(command)))
             # subprocess.run(command, shell=True)
             # subprocess.run(command)
-            result = subprocess.check_output(command)
+            result = subprocess.check_output(command, cwd=cwd)
             result_string = result.decode()
         except subprocess.CalledProcessError as e:
             error_message = "failed: {}".format(e)
@@ -640,30 +2200,153 @@ class CPCopy:
         if self.verbose and self.verbose > self.VERBOSE_DEBUG:
             print(source_abs)
             print(destination)
+        if self.dry_run:
+            print("dry run: would copy '{}' → '{}'".format(source_abs, destination_abs))
+            return
         self.copy_file(source_abs, destination_abs)
 
     ##########################################
 
-    def path_strip_for_target_section(self, path):
-        p = pathlib.Path("artefact/CIRCUITPY_disc/magic_quest_artefact.py")
-        p = pathlib.Path(self.filename_project)
-        result = p
-        # remove *fw* folder from path
-        # if p.parts[0] in PATH_PREFIX_LIST:
-        #     result = pathlib.Path(*p.parts[1:])
+    def board_info_read(self):
+        """
+        Read board info from boot_out.txt (CircuitPython) or INFO_UF2.TXT (bootloader).
+
+        returns dict with 'board_id', 'model' and 'uid' (empty if nothing found).
+        """
+        result = {}
+        if not self.path_target or self.transport != "disc":
+            return result
+        try:
+            with open(os.path.join(self.path_target, "boot_out.txt")) as f:
+                lines = f.read().splitlines()
+            # 'Adafruit CircuitPython 8.2.0 on 2023-06-01; <model> with <mcu>'
+            if lines and ";" in lines[0]:
+                result["model"] = lines[0].split(";", 1)[1].rsplit(" with ", 1)[0].strip()
+            for line in lines:
+                if line.startswith("Board ID:"):
+                    result["board_id"] = line.split(":", 1)[1].strip()
+                elif line.startswith("UID:"):
+                    result["uid"] = line.split(":", 1)[1].strip()
+        except OSError:
+            pass
+        try:
+            with open(os.path.join(self.path_target, "INFO_UF2.TXT")) as f:
+                for line in f:
+                    if line.startswith("Model:"):
+                        result["model"] = line.split(":", 1)[1].strip()
+                    elif line.startswith("Board-ID:"):
+                        result["board_id"] = line.split(":", 1)[1].strip()
+        except OSError:
+            pass
+        return result
 
+    def project_config_load(self):
+        """Load project config file. (empty dict if not found)"""
+        filename = os.path.join(self.path_project, self.FILENAME_PROJECT_CONFIG)
+        try:
+            with open(filename) as f:
+                return json.load(f)
+        except OSError:
+            return {}
+        except ValueError as e:
+            print("error in '{}': {}".format(filename, e))
+            return {}
+
+    def board_profiles_load(self):
+        """Get board profile table. (build in profiles updated with project profiles)"""
+        if self.board_profiles is None:
+            self.board_profiles = {
+                board: dict(profile) for board, profile in self.BOARD_PROFILES.items()
+            }
+            project_profiles = self.project_config_load().get("board_profiles", {})
+            for board, profile in project_profiles.items():
+                self.board_profiles.setdefault(board, {}).update(profile)
+        return self.board_profiles
+
+    def board_detect(self):
+        """
+        Detect board id.
+
+        order: --board, project config 'board', board info on disc,
+        last detected board for this project (cache).
+        raises ValueError if nothing is found - before anything is compiled.
+        """
+        board = self.board or self.project_config_load().get("board")
+        if board:
+            return board
+        profiles = self.board_profiles_load()
+        cache_filename = os.path.join(get_cache_dir(), "board_detected.json")
+        try:
+            with open(cache_filename) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        project_key = os.path.abspath(self.path_project)
+
+        info = self.board_info_read()
+        board = info.get("board_id")
+        if board not in profiles and info.get("model"):
+            # bootloaders report their own ids - so match the model name.
+            for board_profile, profile in profiles.items():
+                model = profile.get("model")
+                if model and model.lower() in info["model"].lower():
+                    board = board_profile
+                    break
+        if board:
+            if cache.get(project_key) != board:
+                cache[project_key] = board
+                with open(cache_filename, "w") as f:
+                    json.dump(cache, f, indent=4)
+            return board
+        if project_key in cache:
+            if self.verbose:
+                print("no board info found. using last detected board.")
+            return cache[project_key]
+        raise ValueError(
+            "no board detected (no boot_out.txt / INFO_UF2.TXT found). "
+            "use --board or set 'board' in '{}'. known boards: {}".format(
+                self.FILENAME_PROJECT_CONFIG, ", ".join(sorted(profiles))
+            )
+        )
+
+    def board_profile_get(self):
+        """Get profile for current board."""
+        board = self.board_detect()
+        profiles = self.board_profiles_load()
+        if board not in profiles:
+            raise ValueError(
+                "no board profile for '{}'. "
+                "add it to 'board_profiles' in '{}'.".format(
+                    board, self.FILENAME_PROJECT_CONFIG
+                )
+            )
+        profile = profiles[board]
+        if self.verbose:
+            print("board profile '{}': {}".format(board, profile))
+        return profile
+
+    ##########################################
+
+    def path_find_target_section_root(self, path):
+        """Find first parent folder that matches PATH_PREFIX_LIST."""
+        p = pathlib.Path(path)
         cp_disc_start_point = pathlib.Path()
-        found = False
         for part in p.parent.parts:
             cp_disc_start_point = cp_disc_start_point / part
             for prefix in self.PATH_PREFIX_LIST:
                 if prefix in part:
-                    found = True
-                    break
-            if found:
-                break
+                    return cp_disc_start_point
+        return None
 
-        if found:
+    def path_strip_for_target_section(self, path):
+        p = pathlib.Path(path)
+        result = p
+        # remove *fw* folder from path
+        # if p.parts[0] in PATH_PREFIX_LIST:
+        #     result = pathlib.Path(*p.parts[1:])
+
+        cp_disc_start_point = self.path_find_target_section_root(p)
+        if cp_disc_start_point is not None:
             # print(f"cp_disc_start_point: '{cp_disc_start_point}'")
             # print(f"p: '{p}'")
             # remove all parent directories..
@@ -761,6 +2444,7 @@ def main():
     path_project_default = "."
     path_arduino_default = ""
     path_uf2_default = ""
+    display_depth_default = 8
 
     parser = argparse.ArgumentParser(description=CPCopy.__doc__)
 
@@ -810,6 +2494,105 @@ def main():
         "".format(path_uf2_default),
         default=path_uf2_default,
     )
+    parser.add_argument(
+        "-t",
+        "--transport",
+        help="how to write files to the board. "
+        "'serial' uses the raw REPL for boards without USB drive. "
+        "'web' uses the web workflow file API. "
+        "(defaults to {})"
+        "".format(CPCopy.TRANSPORT_DEFAULT),
+        default=CPCopy.TRANSPORT_DEFAULT,
+        choices=CPCopy.TRANSPORTS,
+    )
+    parser.add_argument(
+        "-sp",
+        "--serial_port",
+        help="serial port of the board for transport 'serial'. (example: /dev/ttyUSB0)",
+        default=None,
+    )
+    parser.add_argument(
+        "-wh",
+        "--web_host",
+        help="host of the board for transport 'web'. (example: cpy-123456.local)",
+        default=None,
+    )
+    parser.add_argument(
+        "-wp",
+        "--web_password",
+        help="web workflow password. "
+        "(defaults to environment variable CIRCUITPY_WEB_API_PASSWORD)",
+        default=os.environ.get("CIRCUITPY_WEB_API_PASSWORD", ""),
+    )
+    parser.add_argument(
+        "-wj",
+        "--web_parallel",
+        help="number of parallel uploads for transport 'web'. (defaults to 4)",
+        default=4,
+        type=int,
+    )
+    parser.add_argument(
+        "-m",
+        "--monitor",
+        help="show serial console output after copy "
+        "and measure latency to first program output.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-md",
+        "--monitor_duration",
+        help="seconds to monitor the serial console. (defaults to 10)",
+        default=10,
+        type=float,
+    )
+    parser.add_argument(
+        "-n",
+        "--dry_run",
+        help="only print what would be written, skipped and deleted "
+        "and the estimated duration.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-b",
+        "--board",
+        help="board id for arduino compile / uf2 conversion. "
+        "(defaults to auto detection from the disc)",
+        default=None,
+    )
+    parser.add_argument(
+        "-bs",
+        "--boards",
+        help="comma separated board ids for action COMPILE_ARDUINO_PROFILES. "
+        "(defaults to all 'board_profiles' in {})"
+        "".format(CPCopy.FILENAME_PROJECT_CONFIG),
+        default=None,
+        type=lambda value: [board.strip() for board in value.split(",") if board.strip()],
+    )
+    parser.add_argument(
+        "-ca",
+        "--convert_assets",
+        help="convert assets (BDF fonts → PCF, BMP → display depth) before copy. "
+        "(action COPY_ASSETS always converts)",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-dd",
+        "--display_depth",
+        help="color depth in bits of the target display for BMP conversion. "
+        "up to 8 → palettized, 16 → RGB565. "
+        "(defaults to {})"
+        "".format(display_depth_default),
+        default=display_depth_default,
+        type=int,
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="number of parallel workers for asset conversion. "
+        "(defaults to number of CPUs)",
+        default=None,
+        type=int,
+    )
     # parser.add_argument(
     #     "-c",
     #     "--compile",
@@ -819,6 +2602,8 @@ def main():
     parser.add_argument("--version", action="version", version="%(prog)s 0.1.0")
     parser.add_argument("-v", "--verbose", action="count")
     args = parser.parse_args()
+    if args.action == "PULL" and args.transport != "disc":
+        parser.error("action PULL is only supported with transport 'disc'.")
 
     cp_copy = CPCopy(
         action=args.action,
@@ -828,6 +2613,19 @@ def main():
         path_arduino=args.path_arduino,
         path_uf2=args.path_uf2,
         verbose=args.verbose,
+        convert_assets=args.convert_assets,
+        display_depth=args.display_depth,
+        jobs=args.jobs,
+        transport=args.transport,
+        serial_port=args.serial_port,
+        web_host=args.web_host,
+        web_password=args.web_password,
+        web_parallel=args.web_parallel,
+        monitor=args.monitor,
+        monitor_duration=args.monitor_duration,
+        dry_run=args.dry_run,
+        board=args.board,
+        boards=args.boards,
     )
     cp_copy.process()
 